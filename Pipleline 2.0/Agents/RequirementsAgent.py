@@ -2,6 +2,7 @@ import PyPDF2
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from BaseAgent import BaseAgent
+from rag.pdf_text import PDFIUM_AVAILABLE, extract_pdf_text
 
 class RequirementsAgent(BaseAgent):
     """This agent is responsible for gathering requirements from the user.
@@ -25,11 +26,20 @@ class RequirementsAgent(BaseAgent):
         self.read_requirements()
 
     def read_requirements(self):
-        with open(self.file_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+        text = None
+        if PDFIUM_AVAILABLE:
+            # PDFium is much faster than PyPDF2; fall back if it cannot read the file.
+            # RAG ingestion may be parsing PDFs on other threads, so go through the
+            # shared helper, which holds the process-wide PDFium lock
+            try:
+                text = extract_pdf_text(self.file_path)
+            except Exception as e:
+                print(f"pypdfium2 could not read {self.file_path}, falling back to PyPDF2: {e}")
+                text = None
+        if text is None:
+            with open(self.file_path, "rb") as file:
+                reader = PyPDF2.PdfReader(file)
+                text = "\n".join(page.extract_text() or "" for page in reader.pages)
         self.context = text.strip()
         return  self.context
 
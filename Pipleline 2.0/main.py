@@ -31,6 +31,13 @@ class Pipeline:
 
     def enable_rag(self, enabled=True):
         """Enable or disable RAG for all agents"""
+        if enabled and self.document_store is not None:
+            # DocumentStore opens ChromaDB lazily, so check it can be opened now
+            try:
+                self.document_store.collection
+            except Exception as e:
+                print(f"Could not initialize RAG: {str(e)}")
+                self.document_store = None
         self.rag_enabled = enabled and self.document_store is not None
         return self.rag_enabled
     
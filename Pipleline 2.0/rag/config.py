@@ -4,21 +4,66 @@ class RAGConfig:
     # ChromaDB settings
     CHROMA_PERSIST_DIRECTORY = os.environ.get("CHROMA_DB_DIR", os.path.abspath(os.path.join(os.path.dirname(__file__), "../chroma_db")))
     COLLECTION_NAME = "lab_documents"
+    MANIFEST_FILENAME = "manifest.json"  # Per-document summary kept next to the collection
+    
+    # HNSW index settings, applied when the collection is created.
+    # The knowledge base is written once and read many times, so a denser
+    # graph (higher M / construction_ef) is worth the extra build cost.
+    HNSW_SPACE = "l2"
+    HNSW_M = 24
+    HNSW_CONSTRUCTION_EF = 128
+    HNSW_SEARCH_EF = 100
+    HNSW_BATCH_SIZE = 1000
+    HNSW_SYNC_THRESHOLD = 10000
     
     # Text splitting settings
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
     
+    # Ingestion settings
+    INGEST_BATCH_SIZE = 128  # Chunks per collection.add call
+    BULK_INGEST_BATCH_SIZE = 5000  # Chunks per collection.add call in bulk_ingest
+    EMBEDDING_BATCH_SIZE = 256  # Chunks per embedding call, across documents
+    LOADER_MAX_WORKERS = 8  # Threads used to load documents in add_documents
+    
+    # SQLite tuning for write-heavy ingestion; trades crash durability for speed
+    FAST_INGEST = True
+    SQLITE_PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-200000",
+        "PRAGMA mmap_size=268435456",
+    ]
+    
     # Search settings
     DEFAULT_SEARCH_RESULTS = 5
     SIMILARITY_THRESHOLD = 0.7
     
+    # Query cache settings
+    QUERY_CACHE_ENABLED = True
+    QUERY_CACHE_SIZE = 512
+    QUERY_CACHE_SIMILARITY_THRESHOLD = 0.97  # Cosine similarity for near-duplicate hits
+    
+    # Query warm-up settings
+    # Warming up opens ChromaDB and loads the embedding model when RAG is initialized,
+    # giving up the lazy start of DocumentStore in exchange for instant pipeline searches.
+    # It is skipped whenever warm results could not be served (see warm_results_enabled)
+    WARMUP_ON_INIT = True
+    # Warmed results are for the raw prompts; by default they are only served when
+    # QUERY_REFORMULATION_ENABLED is off, since reformulation would search a different query
+    WARM_QUERIES_BYPASS_REFORMULATION = False
+    
     # Supported file types
     SUPPORTED_FILE_TYPES = ['.pdf', '.docx', '.doc', '.txt']
     
     # Embedding model
     EMBEDDING_MODEL = "models/embedding-001"
     
+    # Embedding cache settings
+    EMBEDDING_CACHE_ENABLED = True
+    EMBEDDING_CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../embedding_cache/embeddings.sqlite3"))
+    
     # RAG enhancement settings
     QUERY_REFORMULATION_ENABLED = True
     RERANKING_ENABLED = False
@@ -38,4 +83,20 @@ class RAGConfig:
         return {
             "persist_directory": cls.CHROMA_PERSIST_DIRECTORY,
             "collection_name": cls.COLLECTION_NAME
-        }
\ No newline at end of file
+        }
+    
+    @classmethod
+    def warm_results_enabled(cls):
+        # Warmed results are for the raw prompts, so reformulated searches cannot use them
+        return not cls.QUERY_REFORMULATION_ENABLED or cls.WARM_QUERIES_BYPASS_REFORMULATION
+    
+    @classmethod
+    def get_collection_metadata(cls):
+        return {
+            "hnsw:space": cls.HNSW_SPACE,
+            "hnsw:M": cls.HNSW_M,
+            "hnsw:construction_ef": cls.HNSW_CONSTRUCTION_EF,
+            "hnsw:search_ef": cls.HNSW_SEARCH_EF,
+            "hnsw:batch_size": cls.HNSW_BATCH_SIZE,
+            "hnsw:sync_threshold": cls.HNSW_SYNC_THRESHOLD
+        }
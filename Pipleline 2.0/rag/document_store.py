@@ -1,7 +1,16 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import os
 import sys
+import json
+import sqlite3
+import threading
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from .config import RAGConfig
+from .embedding_cache import EmbeddingCache
+from .query_cache import QueryCache
+from .pdf_text import PDFIUM_AVAILABLE, iter_pdf_pages
 
 # Import and apply telemetry patch before importing ChromaDB
 from . import patch_chromadb_telemetry
@@ -12,6 +21,22 @@ import chromadb
 from chromadb.utils import embedding_functions
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Rust-backed splitter (semantic-text-splitter) is much faster than the pure Python one
+try:
+    from semantic_text_splitter import TextSplitter as NativeTextSplitter
+    NATIVE_SPLITTER_AVAILABLE = True
+except ImportError:
+    NATIVE_SPLITTER_AVAILABLE = False
+
+# Guards read-modify-write of the manifest file shared by every DocumentStore in
+# this process; re-entrant because opening the collection may reset the manifest
+_MANIFEST_LOCK = threading.RLock()
+
+# Write counters per persist directory, shared by every DocumentStore in this
+# process so that writes through one instance invalidate the others' cached results
+_WRITE_VERSIONS = {}
+_WRITE_VERSIONS_LOCK = threading.Lock()
+
 # Try to import document loaders from langchain_community
 # If not available, create simplified versions
 try:
@@ -36,28 +61,34 @@ except ImportError:
                 text = f.read()
             return [{"page_content": text, "metadata": {"source": self.file_path}}]
             
+        def lazy_load(self):
+            """Yield document content one page at a time"""
+            yield from self.load()
+            
     # Simple document classes to mimic langchain's structure
     class SimpleTextLoader(SimpleLoader):
         pass
         
     class SimplePyPDFLoader(SimpleLoader):
         def load(self):
+            return list(self.lazy_load())
+            
+        def lazy_load(self):
             try:
                 import PyPDF2
-                pages = []
-                with open(self.file_path, 'rb') as f:
-                    pdf = PyPDF2.PdfReader(f)
-                    for i, page in enumerate(pdf.pages):
-                        text = page.extract_text()
-                        if text:
-                            pages.append({
-                                "page_content": text,
-                                "metadata": {"source": self.file_path, "page": i}
-                            })
-                return pages
             except ImportError:
                 print("PyPDF2 not installed. Using simple text loader as fallback.")
-                return super().load()
+                yield from super().load()
+                return
+            with open(self.file_path, 'rb') as f:
+                pdf = PyPDF2.PdfReader(f)
+                for i, page in enumerate(pdf.pages):
+                    text = page.extract_text()
+                    if text:
+                        yield {
+                            "page_content": text,
+                            "metadata": {"source": self.file_path, "page": i}
+                        }
                 
     # Define aliases to match langchain imports
     PyPDFLoader = SimplePyPDFLoader
@@ -65,6 +96,38 @@ except ImportError:
     Docx2txtLoader = SimpleTextLoader  # Fallback to simple text loading
     UnstructuredHTMLLoader = SimpleTextLoader  # Fallback to simple text loading
 
+class PdfiumLoader:
+    """
+    PDF loader backed by rag.pdf_text. LangChain's PyPDFium2Loader is not used
+    because it does not share PDFIUM_LOCK with the other PDFium callers.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        
+    def load(self):
+        return list(self.lazy_load())
+        
+    def lazy_load(self):
+        for i, text in iter_pdf_pages(self.file_path):
+            if text:
+                yield {
+                    "page_content": text,
+                    "metadata": {"source": self.file_path, "page": i}
+                }
+
+# Text splitter shared by every DocumentStore (Streamlit may create one per session),
+# preferring the native implementation; splitters hold no per-document state
+if NATIVE_SPLITTER_AVAILABLE:
+    _TEXT_SPLITTER = NativeTextSplitter(
+        RAGConfig.CHUNK_SIZE,
+        overlap=RAGConfig.CHUNK_OVERLAP
+    )
+else:
+    _TEXT_SPLITTER = RecursiveCharacterTextSplitter(
+        chunk_size=RAGConfig.CHUNK_SIZE,
+        chunk_overlap=RAGConfig.CHUNK_OVERLAP
+    )
+
 class DocumentStore:
     """Document store for retrieval augmented generation"""
     
@@ -72,12 +135,55 @@ class DocumentStore:
         """Initialize the document store with the specified embedding model"""
         self.config = RAGConfig()
         self.embedding_model = embedding_model or self.config.EMBEDDING_MODEL
+        self.text_splitter = _TEXT_SPLITTER
+        
+        # Cache search results in memory; cleared whenever the collection changes
+        self.query_cache = None
+        if self.config.QUERY_CACHE_ENABLED:
+            self.query_cache = QueryCache(
+                max_size=self.config.QUERY_CACHE_SIZE,
+                similarity_threshold=self.config.QUERY_CACHE_SIMILARITY_THRESHOLD
+            )
         
-        # Initialize the embedding function
-        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        # Embeddings and results of known queries, filled by warmup()
+        self.warm_queries = {}
         
+        # Client whose SQLite connection has been tuned, per writing thread
+        self._sqlite_tuned = threading.local()
+    
+    @cached_property
+    def embedding_cache(self):
+        """
+        On-disk cache so identical chunks are only embedded once, opened on first use.
+        None if the cache is disabled or cannot be opened.
+        """
+        if not self.config.EMBEDDING_CACHE_ENABLED:
+            return None
+        try:
+            return EmbeddingCache(self.config.EMBEDDING_CACHE_PATH)
+        except Exception as e:
+            print(f"Embedding cache unavailable, embedding without cache: {str(e)}")
+            return None
+    
+    @cached_property
+    def embedding_function(self):
+        """Embedding function, created on first use"""
+        return embedding_functions.DefaultEmbeddingFunction()
+    
+    @cached_property
+    def client(self):
+        """Chroma client, opened together with the collection on first use"""
+        # Opening the collection assigns self.client as a side effect
+        self.collection
+        return self.__dict__["client"]
+    
+    @cached_property
+    def collection(self):
+        """
+        Chroma collection, opened on first use so that creating a DocumentStore
+        does not pay for opening ChromaDB until RAG is actually used
+        """
         # Create the directory if it doesn't exist
-        import os
         persist_dir = os.path.abspath(self.config.CHROMA_PERSIST_DIRECTORY)
         os.makedirs(persist_dir, exist_ok=True)
         
@@ -103,9 +209,11 @@ class DocumentStore:
                 # Collection doesn't exist, create it
                 self.collection = self.client.create_collection(
                     name=self.config.COLLECTION_NAME,
-                    embedding_function=self.embedding_function
+                    embedding_function=self.embedding_function,
+                    metadata=self.config.get_collection_metadata()
                 )
                 print(f"Created new collection: {self.config.COLLECTION_NAME}")
+                self._reset_manifest()
                 
         except Exception as e:
             print(f"Error initializing ChromaDB: {str(e)}")
@@ -118,11 +226,50 @@ class DocumentStore:
                 self.client = chromadb.PersistentClient(path=persist_dir)
                 self.collection = self.client.create_collection(
                     name=self.config.COLLECTION_NAME,
-                    embedding_function=self.embedding_function
+                    embedding_function=self.embedding_function,
+                    metadata=self.config.get_collection_metadata()
                 )
             except Exception as e2:
                 print(f"Failed to recreate ChromaDB: {str(e2)}")
                 raise ValueError(f"Failed to initialize ChromaDB: {str(e2)}")
+        
+        return self.collection
+    
+    def _apply_sqlite_pragmas(self):
+        """
+        Tune Chroma's SQLite store for write-heavy ingestion (RAGConfig.FAST_INGEST).
+        Trades crash durability for speed, which is acceptable since documents can be re-ingested.
+        Apart from journal_mode these PRAGMAs only affect the connection they run on,
+        and Chroma keeps one connection per thread, so this must run on the writing thread.
+        Runs once per thread and client; a reset database gets a new client.
+        """
+        if getattr(self._sqlite_tuned, "client", None) is self.client:
+            return
+        self._sqlite_tuned.client = self.client
+        
+        persist_dir = os.path.abspath(self.config.CHROMA_PERSIST_DIRECTORY)
+        try:
+            # Chroma's Python SQLite backend (0.4-0.6) exposes its connection pool
+            from chromadb.db.impl.sqlite import SqliteDB
+            conn = self.client._system.instance(SqliteDB)._conn_pool.connect()
+            for pragma in self.config.SQLITE_PRAGMAS:
+                conn.execute(pragma)
+            return
+        except Exception as e:
+            print(f"Could not tune Chroma's SQLite connection, enabling WAL on the database file only: {str(e)}")
+        
+        # journal_mode is stored in the database file, so it also applies to Chroma's own connections
+        db_path = os.path.join(persist_dir, "chroma.sqlite3")
+        if not os.path.exists(db_path):
+            return
+        try:
+            conn = sqlite3.connect(db_path)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Could not enable WAL on {db_path}: {str(e)}")
     
     def check_and_fix_permissions(self, directory):
         """
@@ -175,18 +322,70 @@ class DocumentStore:
             print(f"Error fixing permissions: {str(e)}")
             return False
     
-    def add_document(self, filepath: str) -> bool:
+    def _split_text(self, text: str) -> List[str]:
+        """Split a page of text into chunks"""
+        if NATIVE_SPLITTER_AVAILABLE:
+            return self.text_splitter.chunks(text)
+        
+        if LANGCHAIN_AVAILABLE:
+            return self.text_splitter.split_text(text)
+        
+        # Simple chunking alongside our simple loaders
+        chunk_size = self.config.CHUNK_SIZE
+        overlap = self.config.CHUNK_OVERLAP
+        text_chunks = []
+        for i in range(0, len(text), chunk_size - overlap):
+            chunk = text[i:i + chunk_size]
+            if len(chunk) < chunk_size / 2 and text_chunks:
+                # Merge small final chunks
+                text_chunks[-1] += chunk
+            else:
+                text_chunks.append(chunk)
+        return text_chunks
+    
+    def _split_pages(self, loader) -> Tuple[List[str], List[int]]:
         """
-        Process and add a document to the vector store
-        Returns True if successful, False otherwise
+        Load a document through the given loader and split it into chunks
+        Returns the chunk contents and the page number of each chunk
         """
-        try:
-            file_extension = os.path.splitext(filepath)[1].lower()
-            
-            # Select appropriate loader based on file extension
-            if file_extension == '.pdf':
-                loader = PyPDFLoader(filepath)
-            elif file_extension == '.docx' or file_extension == '.doc':
+        # Stream the document page by page where the loader supports it, so
+        # large PDFs are never held in memory as a whole
+        documents = loader.lazy_load() if hasattr(loader, "lazy_load") else loader.load()
+        
+        # Split each page's text directly; only the page number is kept from the
+        # loader's metadata, so it is not copied onto every chunk
+        contents = []
+        pages = []
+        for doc in documents:
+            content = doc.page_content if hasattr(doc, "page_content") else doc["page_content"]
+            metadata = doc.metadata if hasattr(doc, "metadata") else doc["metadata"]
+            page = metadata.get("page", 0)
+            for chunk in self._split_text(content):
+                contents.append(chunk)
+                pages.append(page)
+        return contents, pages
+    
+    def _split_pdf(self, filepath: str) -> Tuple[List[str], List[int]]:
+        """Split a PDF, preferring PDFium and falling back to PyPDF for files PDFium cannot read"""
+        if PDFIUM_AVAILABLE:
+            try:
+                return self._split_pages(PdfiumLoader(filepath))
+            except Exception as e:
+                print(f"pypdfium2 could not read {filepath}, falling back to PyPDF: {str(e)}")
+        return self._split_pages(PyPDFLoader(filepath))
+    
+    def _load_chunks(self, filepath: str) -> Optional[Tuple[List[str], List[str], List[Dict]]]:
+        """
+        Load and split a document into chunks
+        Returns a tuple of (ids, contents, metadatas), or None for unsupported file types
+        """
+        file_extension = os.path.splitext(filepath)[1].lower()
+        
+        # Select appropriate loader based on file extension
+        if file_extension == '.pdf':
+            contents, pages = self._split_pdf(filepath)
+        else:
+            if file_extension == '.docx' or file_extension == '.doc':
                 loader = Docx2txtLoader(filepath)
             elif file_extension == '.txt':
                 loader = TextLoader(filepath)
@@ -194,59 +393,32 @@ class DocumentStore:
                 loader = UnstructuredHTMLLoader(filepath)
             else:
                 print(f"Unsupported file type: {file_extension}")
+                return None
+            contents, pages = self._split_pages(loader)
+        
+        # Build ids and metadata so the chunks can be added in batches
+        id_prefix = f"{os.path.basename(filepath)}-"
+        ids = [id_prefix + str(i) for i in range(len(pages))]
+        metadatas = [
+            {"source": filepath, "page": page, "chunk": i}
+            for i, page in enumerate(pages)
+        ]
+        
+        return ids, contents, metadatas
+    
+    def add_document(self, filepath: str) -> bool:
+        """
+        Process and add a document to the vector store
+        Returns True if successful, False otherwise
+        """
+        try:
+            loaded = self._load_chunks(filepath)
+            if loaded is None:
                 return False
             
-            # Load the document
-            documents = loader.load()
-            
-            # If using our simple loaders that don't have langchain's structure
-            if not LANGCHAIN_AVAILABLE:
-                chunks = []
-                for doc in documents:
-                    # Simple chunking if langchain_text_splitters not available
-                    text = doc["page_content"]
-                    chunk_size = self.config.CHUNK_SIZE
-                    overlap = self.config.CHUNK_OVERLAP
-                    text_chunks = []
-                    
-                    for i in range(0, len(text), chunk_size - overlap):
-                        chunk = text[i:i + chunk_size]
-                        if len(chunk) < chunk_size / 2 and text_chunks:
-                            # Merge small final chunks
-                            text_chunks[-1] += chunk
-                        else:
-                            text_chunks.append(chunk)
-                    
-                    for i, chunk in enumerate(text_chunks):
-                        chunks.append({
-                            "page_content": chunk,
-                            "metadata": {
-                                **doc["metadata"],
-                                "chunk": i
-                            }
-                        })
-            else:
-                # Split the document into chunks using langchain
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=self.config.CHUNK_SIZE,
-                    chunk_overlap=self.config.CHUNK_OVERLAP
-                )
-                chunks = text_splitter.split_documents(documents)
-            
-            # Add chunks to the collection
-            for i, chunk in enumerate(chunks):
-                content = chunk.page_content if hasattr(chunk, "page_content") else chunk["page_content"]
-                metadata = chunk.metadata if hasattr(chunk, "metadata") else chunk["metadata"]
-                
-                self.collection.add(
-                    ids=[f"{os.path.basename(filepath)}-{i}"],
-                    documents=[content],
-                    metadatas=[{
-                        "source": filepath,
-                        "page": metadata.get("page", 0),
-                        "chunk": i
-                    }]
-                )
+            ids, contents, metadatas = loaded
+            self._add_chunks(ids, contents, metadatas)
+            self._record_document(filepath, len(ids))
             
             return True
         
@@ -254,6 +426,268 @@ class DocumentStore:
             print(f"Error adding document: {str(e)}")
             return False
     
+    def _load_documents(self, filepaths: List[str]) -> List[Tuple[int, List[str], List[str], List[Dict]]]:
+        """
+        Load and split several documents concurrently; parsing is mostly file I/O
+        Returns (index, ids, contents, metadatas) for each document that loaded
+        """
+        max_workers = min(self.config.LOADER_MAX_WORKERS, len(filepaths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._load_chunks, filepath) for filepath in filepaths]
+        
+        loaded_docs = []
+        for index, future in enumerate(futures):
+            try:
+                loaded = future.result()
+            except Exception as e:
+                print(f"Error loading document {filepaths[index]}: {str(e)}")
+                continue
+            if loaded is not None:
+                loaded_docs.append((index, *loaded))
+        return loaded_docs
+    
+    def add_documents(self, filepaths: List[str]) -> List[bool]:
+        """
+        Process and add several documents to the vector store.
+        Chunks from all documents are embedded together in batches of
+        EMBEDDING_BATCH_SIZE, so N files cost a few embedding calls rather than N.
+        Returns a list of success flags in the same order as filepaths
+        """
+        results = [False] * len(filepaths)
+        
+        if not filepaths:
+            return results
+        
+        # Open the collection and embedding function before the embedding thread
+        # starts using them; if ChromaDB cannot be opened, no document is added
+        try:
+            self.collection
+        except Exception as e:
+            print(f"Error adding documents: {str(e)}")
+            return results
+        
+        # Remember which slice of the combined chunk list belongs to which file
+        loaded_docs = []
+        all_contents = []
+        for index, ids, contents, metadatas in self._load_documents(filepaths):
+            start = len(all_contents)
+            all_contents.extend(contents)
+            loaded_docs.append((index, ids, metadatas, start, len(all_contents)))
+        
+        # Embed all chunks in cross-document batches on a background thread, so
+        # embedding later batches overlaps with writing earlier documents
+        batch_size = self.config.EMBEDDING_BATCH_SIZE
+        with ThreadPoolExecutor(max_workers=1) as embedder:
+            embedding_batches = [
+                embedder.submit(self._embed_with_cache, all_contents[start:start + batch_size])
+                for start in range(0, len(all_contents), batch_size)
+            ]
+            
+            # Scatter the embeddings back to their documents and add each one
+            for index, ids, metadatas, start, end in loaded_docs:
+                try:
+                    embeddings = self._collect_embeddings(embedding_batches, batch_size, start, end)
+                    self._add_chunks(ids, all_contents[start:end], metadatas, embeddings)
+                    self._record_document(filepaths[index], len(ids))
+                    results[index] = True
+                except Exception as e:
+                    print(f"Error adding document {filepaths[index]}: {str(e)}")
+        
+        return results
+    
+    def bulk_ingest(self, filepaths: List[str]) -> List[bool]:
+        """
+        Add a whole corpus (e.g. the first import of the lab documents) in as few
+        collection.add calls as Chroma allows. Chunks from all documents are
+        concatenated and written in adds of BULK_INGEST_BATCH_SIZE records (capped
+        at Chroma's maximum batch size), instead of at least one add per document.
+        Returns a list of success flags in the same order as filepaths
+        """
+        results = [False] * len(filepaths)
+        
+        if not filepaths:
+            return results
+        
+        # Open the collection and embedding function before the embedding thread
+        # starts using them; if ChromaDB cannot be opened, no document is added
+        try:
+            self.collection
+        except Exception as e:
+            print(f"Error adding documents: {str(e)}")
+            return results
+        
+        add_size = self.config.BULK_INGEST_BATCH_SIZE
+        try:
+            # Chroma caps the number of records accepted by a single add
+            add_size = min(add_size, self.client.get_max_batch_size())
+        except Exception:
+            pass
+        
+        # Concatenate all documents' chunks. A repeated id would make Chroma reject
+        # the whole add, so later duplicates are skipped, as separate adds would ignore them
+        loaded_docs = []
+        all_ids = []
+        all_contents = []
+        all_metadatas = []
+        seen_ids = set()
+        for index, ids, contents, metadatas in self._load_documents(filepaths):
+            start = len(all_ids)
+            for chunk_id, content, metadata in zip(ids, contents, metadatas):
+                if chunk_id not in seen_ids:
+                    seen_ids.add(chunk_id)
+                    all_ids.append(chunk_id)
+                    all_contents.append(content)
+                    all_metadatas.append(metadata)
+            loaded_docs.append((index, len(ids), start, len(all_ids)))
+        
+        # Embed in the background while earlier adds are written
+        batch_size = self.config.EMBEDDING_BATCH_SIZE
+        failed_ranges = []
+        with ThreadPoolExecutor(max_workers=1) as embedder:
+            embedding_batches = [
+                embedder.submit(self._embed_with_cache, all_contents[start:start + batch_size])
+                for start in range(0, len(all_contents), batch_size)
+            ]
+            
+            for start in range(0, len(all_ids), add_size):
+                end = min(start + add_size, len(all_ids))
+                try:
+                    embeddings = self._collect_embeddings(embedding_batches, batch_size, start, end)
+                    self._add_chunks(all_ids[start:end], all_contents[start:end], all_metadatas[start:end], embeddings, add_size)
+                except Exception as e:
+                    print(f"Error adding chunks {start}-{end}: {str(e)}")
+                    failed_ranges.append((start, end))
+        
+        # A document succeeded if none of its chunks were in a failed add
+        for index, chunk_count, start, end in loaded_docs:
+            if all(end <= failed_start or start >= failed_end for failed_start, failed_end in failed_ranges):
+                self._record_document(filepaths[index], chunk_count)
+                results[index] = True
+            else:
+                print(f"Error adding document {filepaths[index]}")
+        
+        return results
+    
+    def _collect_embeddings(self, embedding_batches: List, batch_size: int, start: int, end: int) -> np.ndarray:
+        """Wait for the embedding batches covering chunks [start, end) and return their rows"""
+        if start == end:
+            return np.empty((0, 0), dtype=np.float32)
+        first, last = start // batch_size, (end - 1) // batch_size
+        block = np.concatenate([embedding_batches[i].result() for i in range(first, last + 1)])
+        offset = first * batch_size
+        return block[start - offset:end - offset]
+    
+    def _embedding_cache_model(self) -> str:
+        """
+        Identify the embedding model in the embedding cache, so vectors from a
+        different model (or a different build of the same class) are never reused
+        """
+        embedding_function = self.embedding_function
+        model_name = getattr(embedding_function, "model_name", None) or getattr(embedding_function, "MODEL_NAME", None)
+        if model_name is None and callable(getattr(embedding_function, "name", None)):
+            try:
+                model_name = embedding_function.name()
+            except Exception:
+                pass
+        function_type = type(embedding_function)
+        return f"{function_type.__module__}.{function_type.__qualname__}:{model_name or 'default'}"
+    
+    def _embed_with_cache(self, contents: List[str]) -> np.ndarray:
+        """
+        Embed contents as a float32 matrix, reusing cached embeddings for chunks seen before.
+        Misses are deduplicated so each distinct chunk is embedded only once.
+        """
+        if self.embedding_cache is None:
+            return np.asarray(self.embedding_function(contents), dtype=np.float32)
+        
+        model = self._embedding_cache_model()
+        keys = [EmbeddingCache.hash_text(content) for content in contents]
+        
+        try:
+            cached = self.embedding_cache.get_many(model, keys)
+        except Exception as e:
+            print(f"Error reading embedding cache: {str(e)}")
+            cached = {}
+        
+        # Collect distinct chunks that still need embedding
+        to_embed = {}
+        for key, content in zip(keys, contents):
+            if key not in cached and key not in to_embed:
+                to_embed[key] = content
+        
+        if to_embed:
+            new_embeddings = dict(zip(
+                to_embed.keys(),
+                np.asarray(self.embedding_function(list(to_embed.values())), dtype=np.float32)
+            ))
+            try:
+                self.embedding_cache.set_many(model, new_embeddings)
+            except Exception as e:
+                print(f"Error writing embedding cache: {str(e)}")
+            cached.update(new_embeddings)
+        
+        return np.asarray([cached[key] for key in keys], dtype=np.float32)
+    
+    def _add_chunks(self, ids: List[str], contents: List[str], metadatas: List[Dict], embeddings: Optional[np.ndarray] = None, batch_size: Optional[int] = None):
+        """
+        Embed and add chunks to the collection in batches of INGEST_BATCH_SIZE.
+        Batching avoids one collection.add (and one SQLite transaction) per chunk
+        while keeping memory bounded for large documents.
+        Precomputed embeddings may be passed in to skip the embedding step;
+        otherwise each batch is embedded while the previous one is being written.
+        """
+        # Open the collection and embedding function before the thread starts using them
+        self.collection
+        if self.config.FAST_INGEST:
+            # The batches below are written from this thread; a no-op once it is tuned
+            self._apply_sqlite_pragmas()
+        batch_size = batch_size or self.config.INGEST_BATCH_SIZE
+        try:
+            with ThreadPoolExecutor(max_workers=1) as embedder:
+                # Embed the next batch in the background while the current one is written
+                next_embeddings = None
+                if embeddings is None and contents:
+                    next_embeddings = embedder.submit(self._embed_with_cache, contents[:batch_size])
+                
+                for start in range(0, len(contents), batch_size):
+                    end = start + batch_size
+                    if embeddings is None:
+                        batch_embeddings = next_embeddings.result()
+                        if end < len(contents):
+                            next_embeddings = embedder.submit(self._embed_with_cache, contents[end:end + batch_size])
+                    else:
+                        batch_embeddings = embeddings[start:end]
+                    self.collection.add(
+                        ids=ids[start:end],
+                        documents=contents[start:end],
+                        embeddings=batch_embeddings,
+                        metadatas=metadatas[start:end]
+                    )
+        finally:
+            self._clear_query_cache()
+    
+    def _clear_query_cache(self):
+        """Drop cached search results after the collection is modified"""
+        persist_dir = os.path.abspath(self.config.CHROMA_PERSIST_DIRECTORY)
+        with _WRITE_VERSIONS_LOCK:
+            _WRITE_VERSIONS[persist_dir] = _WRITE_VERSIONS.get(persist_dir, 0) + 1
+        if self.query_cache is not None:
+            self.query_cache.clear()
+        # Warm-up embeddings stay valid; only their results need re-fetching
+        for entry in self.warm_queries.values():
+            entry["results"] = None
+    
+    def _collection_version(self) -> Tuple[int, int]:
+        """
+        Version tag for cached search results: the in-process write counter for
+        this persist directory plus the collection's chunk count, which also
+        changes when another process adds or removes documents
+        """
+        persist_dir = os.path.abspath(self.config.CHROMA_PERSIST_DIRECTORY)
+        with _WRITE_VERSIONS_LOCK:
+            write_version = _WRITE_VERSIONS.get(persist_dir, 0)
+        return write_version, self.collection.count()
+    
     def search_documents(
         self, 
         query: str, 
@@ -265,23 +699,37 @@ class DocumentStore:
         Returns a list of dictionaries containing document ID, content, metadata, and score
         """
         try:
+            # Serve exact repeats straight from the query cache; keying on the
+            # collection version keeps results cached before any write from being served
+            params = (
+                n_results,
+                json.dumps(filter_dict, sort_keys=True, default=str),
+                self._collection_version()
+            )
+            if self.query_cache is not None:
+                cached = self.query_cache.get(query, params)
+                if cached is not None:
+                    return cached
+            
+            query_embedding = np.asarray(self.embedding_function([query])[0], dtype=np.float32)
+            
+            # Reuse results of a near-identical earlier query
+            if self.query_cache is not None:
+                cached = self.query_cache.get_similar(query_embedding, params)
+                if cached is not None:
+                    return cached
+            
             # Query the collection
             results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[query_embedding],
                 n_results=n_results,
                 where=filter_dict  # Filter if provided
             )
             
-            # Format the results
-            formatted_results = []
-            if results['ids'] and len(results['ids'][0]) > 0:
-                for i in range(len(results['ids'][0])):
-                    formatted_results.append({
-                        "id": results['ids'][0][i],
-                        "content": results['documents'][0][i],
-                        "metadata": results['metadatas'][0][i],
-                        "score": results['distances'][0][i] if 'distances' in results else 0
-                    })
+            formatted_results = self._format_query_results(results, 0)
+            
+            if self.query_cache is not None:
+                self.query_cache.put(query, params, query_embedding, formatted_results)
             
             return formatted_results
         
@@ -289,6 +737,73 @@ class DocumentStore:
             print(f"Error searching documents: {str(e)}")
             return []
     
+    def _format_query_results(self, results: Dict, index: int) -> List[Dict[str, Any]]:
+        """Format the results of the query at the given index of a collection.query response"""
+        formatted_results = []
+        if results['ids'] and len(results['ids'][index]) > 0:
+            for i in range(len(results['ids'][index])):
+                formatted_results.append({
+                    "id": results['ids'][index][i],
+                    "content": results['documents'][index][i],
+                    "metadata": results['metadatas'][index][i],
+                    "score": results['distances'][index][i] if 'distances' in results else 0
+                })
+        return formatted_results
+    
+    def warmup(self, queries: List[str], n_results: Optional[int] = None):
+        """
+        Pre-embed known queries (e.g. the pipeline agents' prompts) in one batch
+        and cache their top results so later searches skip embedding and querying.
+        This opens the collection and loads the embedding model straight away.
+        """
+        n_results = n_results or self.config.DEFAULT_SEARCH_RESULTS
+        queries = [query for query in dict.fromkeys(queries) if query and query not in self.warm_queries]
+        if not queries:
+            return
+        
+        try:
+            version = self._collection_version()
+            embeddings = np.asarray(self.embedding_function(queries), dtype=np.float32)
+            results = self.collection.query(
+                query_embeddings=embeddings,
+                n_results=n_results
+            )
+            for i, (query, embedding) in enumerate(zip(queries, embeddings)):
+                self.warm_queries[query] = {
+                    "embedding": embedding,
+                    "n_results": n_results,
+                    "version": version,
+                    "results": self._format_query_results(results, i)
+                }
+        except Exception as e:
+            print(f"Error warming up queries: {str(e)}")
+    
+    def get_warm_results(self, query: str, n_results: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached results for a warmed-up query, or None if the query is unknown.
+        Results invalidated by a write, from this or any other instance, are
+        re-fetched with the stored embedding.
+        """
+        entry = self.warm_queries.get(query)
+        if entry is None:
+            return None
+        
+        try:
+            version = self._collection_version()
+            if entry["results"] is None or entry["n_results"] != n_results or entry["version"] != version:
+                results = self.collection.query(
+                    query_embeddings=[entry["embedding"]],
+                    n_results=n_results
+                )
+                entry["results"] = self._format_query_results(results, 0)
+                entry["n_results"] = n_results
+                entry["version"] = version
+        except Exception as e:
+            print(f"Error searching documents: {str(e)}")
+            return None
+        
+        return [dict(result) for result in entry["results"]]
+    
     def get_document_count(self) -> int:
         """Get the number of documents in the collection"""
         try:
@@ -299,55 +814,132 @@ class DocumentStore:
             try:
                 self.collection = self.client.create_collection(
                     name=self.config.COLLECTION_NAME,
-                    embedding_function=self.embedding_function
+                    embedding_function=self.embedding_function,
+                    metadata=self.config.get_collection_metadata()
                 )
+                self._reset_manifest()
                 print(f"Recreated collection: {self.config.COLLECTION_NAME}")
                 return 0
             except Exception as e2:
                 print(f"Failed to recreate collection: {str(e2)}")
                 return 0
     
+    def _manifest_path(self) -> str:
+        """Path of the manifest file listing the documents in the collection"""
+        return os.path.join(os.path.abspath(self.config.CHROMA_PERSIST_DIRECTORY), self.config.MANIFEST_FILENAME)
+    
+    def _read_manifest(self) -> Optional[Dict[str, Dict]]:
+        """Read the manifest from disk, or return None if it is missing or unreadable"""
+        manifest_path = self._manifest_path()
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading document manifest: {str(e)}")
+            return None
+    
+    def _build_manifest(self) -> Dict[str, Dict]:
+        """Rebuild the manifest from the collection's metadata"""
+        results = self.collection.get(include=["metadatas"])
+        manifest = {}
+        for metadata in results['metadatas'] or []:
+            source = (metadata or {}).get("source", "Unknown")
+            entry = manifest.setdefault(source, {"source": source, "count": 0})
+            entry["count"] += 1
+        return manifest
+    
+    def _is_manifest_current(self, manifest: Optional[Dict[str, Dict]]) -> bool:
+        """
+        Cheap staleness check: other DocumentStore instances or processes may have
+        changed the collection, in which case its chunk total no longer matches
+        """
+        if manifest is None:
+            return False
+        return sum(entry["count"] for entry in manifest.values()) == self.collection.count()
+    
+    def _get_manifest(self) -> Dict[str, Dict]:
+        """
+        Return the {source: {"source", "count"}} manifest, re-reading it from disk
+        and rebuilding it from the collection's metadata if it is missing or stale
+        """
+        with _MANIFEST_LOCK:
+            manifest = self._read_manifest()
+            if not self._is_manifest_current(manifest):
+                manifest = self._build_manifest()
+                self._save_manifest(manifest)
+            return manifest
+    
+    def _save_manifest(self, manifest: Dict[str, Dict]):
+        """Write the manifest atomically via a temporary file"""
+        manifest_path = self._manifest_path()
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, manifest_path)
+    
+    def _update_manifest(self, source: str, chunk_count: int):
+        """Set a document's chunk count in the manifest, dropping the entry when it is 0"""
+        try:
+            with _MANIFEST_LOCK:
+                # Re-read under the lock so concurrent updates are not lost
+                manifest = self._read_manifest()
+                if manifest is not None:
+                    if chunk_count:
+                        manifest[source] = {"source": source, "count": chunk_count}
+                    else:
+                        manifest.pop(source, None)
+                if not self._is_manifest_current(manifest):
+                    manifest = self._build_manifest()
+                self._save_manifest(manifest)
+        except Exception as e:
+            print(f"Error updating document manifest: {str(e)}")
+            self._discard_manifest()
+    
+    def _record_document(self, source: str, chunk_count: int):
+        """Record an added document in the manifest"""
+        if chunk_count == 0:
+            return
+        self._update_manifest(source, chunk_count)
+    
+    def _discard_manifest(self):
+        """Drop the manifest so it is rebuilt from the collection on next use"""
+        try:
+            with _MANIFEST_LOCK:
+                if os.path.exists(self._manifest_path()):
+                    os.remove(self._manifest_path())
+        except Exception as e:
+            print(f"Error removing document manifest: {str(e)}")
+    
+    def _reset_manifest(self):
+        """Reset the manifest after the collection has been emptied"""
+        try:
+            with _MANIFEST_LOCK:
+                self._save_manifest({})
+        except Exception as e:
+            print(f"Error resetting document manifest: {str(e)}")
+    
     def list_all_documents(self) -> List[Dict]:
-        """List all documents in the collection with their metadata"""
+        """List all documents in the collection with their chunk counts"""
         try:
-            # Get all documents from the collection (up to a reasonable limit)
-            results = self.collection.peek(limit=1000)
-            
-            # Format the results in a more useful way
-            document_list = []
-            if results['ids'] and len(results['ids']) > 0:
-                for i in range(len(results['ids'])):
-                    document_list.append({
-                        "id": results['ids'][i],
-                        "content": results['documents'][i] if i < len(results['documents']) else "",
-                        "metadata": results['metadatas'][i] if i < len(results['metadatas']) else {},
-                    })
-            
-            # Group by source file for better UI display
-            grouped_docs = {}
-            for doc in document_list:
-                source = doc["metadata"].get("source", "Unknown")
-                if source not in grouped_docs:
-                    grouped_docs[source] = []
-                grouped_docs[source].append(doc)
-            
-            # Convert to list of sources with document counts
-            result = [{"source": source, "count": len(docs)} for source, docs in grouped_docs.items()]
-            return result
-            
+            return [dict(entry) for entry in self._get_manifest().values()]
         except Exception as e:
             print(f"Error listing documents: {str(e)}")
             return []
     
     def delete_collection(self) -> bool:
         """Delete the entire collection and recreate an empty one. Use with caution!"""
+        self._clear_query_cache()
         try:
             self.client.delete_collection(self.config.COLLECTION_NAME)
             # Immediately recreate the collection to avoid "not found" errors
             self.collection = self.client.create_collection(
                 name=self.config.COLLECTION_NAME,
-                embedding_function=self.embedding_function
+                embedding_function=self.embedding_function,
+                metadata=self.config.get_collection_metadata()
             )
+            self._reset_manifest()
             print(f"Deleted and recreated empty collection: {self.config.COLLECTION_NAME}")
             return True
         except Exception as e:
@@ -356,17 +948,20 @@ class DocumentStore:
             try:
                 self.collection = self.client.create_collection(
                     name=self.config.COLLECTION_NAME, 
-                    embedding_function=self.embedding_function
+                    embedding_function=self.embedding_function,
+                    metadata=self.config.get_collection_metadata()
                 )
+                self._reset_manifest()
                 return True
             except:
                 return False
     
     def reset_database(self) -> bool:
         """Completely reset the database by recreating the ChromaDB directory"""
+        self._clear_query_cache()
         try:
             # Close the client connection if possible
-            if hasattr(self, 'client') and hasattr(self.client, 'close'):
+            if 'client' in self.__dict__ and hasattr(self.client, 'close'):
                 try:
                     self.client.close()
                     # Sleep briefly to ensure connection is closed
@@ -431,8 +1026,10 @@ class DocumentStore:
             self.client = chromadb.PersistentClient(path=persist_dir)
             self.collection = self.client.create_collection(
                 name=self.config.COLLECTION_NAME,
-                embedding_function=self.embedding_function
+                embedding_function=self.embedding_function,
+                metadata=self.config.get_collection_metadata()
             )
+            self._reset_manifest()
             print(f"Database completely reset at {persist_dir}")
             return True
         except Exception as e:
@@ -441,33 +1038,32 @@ class DocumentStore:
     
     def remove_document(self, doc_id: str) -> bool:
         """Remove a specific document from the collection by ID or path"""
+        self._clear_query_cache()
         try:
             # If doc_id is a path, we need to find all chunks with that path
             if os.path.exists(doc_id) or '/' in doc_id or '\\' in doc_id:
                 # This is a file path, find all documents with this source
                 source_path = doc_id
                 
-                # Get all documents
-                results = self.collection.peek(limit=1000)
+                # Delete all chunks for this source in one call instead of
+                # reading their metadata back first
+                count_before = self.collection.count()
+                self.collection.delete(where={"source": source_path})
+                # The delete is authoritative: once it succeeds the source is gone.
+                # Other writers may change the count meanwhile, so it is only logged
+                removed = count_before - self.collection.count()
+                self._update_manifest(source_path, 0)
                 
-                # Find document IDs matching the source
-                ids_to_delete = []
-                if results['ids'] and len(results['ids']) > 0:
-                    for i, metadata in enumerate(results['metadatas']):
-                        if 'source' in metadata and metadata['source'] == source_path:
-                            ids_to_delete.append(results['ids'][i])
-                
-                if ids_to_delete:
-                    # Delete documents by ID
-                    self.collection.delete(ids=ids_to_delete)
-                    print(f"Removed {len(ids_to_delete)} chunks for document: {source_path}")
-                    return True
+                if removed > 0:
+                    print(f"Removed {removed} chunks for document: {source_path}")
                 else:
-                    print(f"No documents found with source: {source_path}")
-                    return False
+                    print(f"No chunks removed for document: {source_path}")
+                return True
             else:
                 # Direct ID deletion
                 self.collection.delete(ids=[doc_id])
+                # The chunk's source is unknown here, so rebuild the manifest on next use
+                self._discard_manifest()
                 return True
         except Exception as e:
             print(f"Error removing document: {str(e)}")
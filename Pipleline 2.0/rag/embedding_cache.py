@@ -0,0 +1,71 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Persistent SQLite cache of chunk embeddings keyed by (model, sha256(chunk))"""
+
+    # Stay well below SQLite's limit on bound parameters per statement
+    _LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: str):
+        """Open (or create) the cache database at the given path"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Streamlit reruns the script on different threads, so the connection is
+        # shared across threads and guarded by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, "
+                "chunk_hash TEXT NOT NULL, "
+                "embedding BLOB NOT NULL, "
+                "PRIMARY KEY (model, chunk_hash))"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Return the cache key for a chunk of text"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up embeddings for the given keys, returning only the hits"""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique_keys), self._LOOKUP_BATCH_SIZE):
+                batch = unique_keys[start:start + self._LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT chunk_hash, embedding FROM embeddings "
+                    f"WHERE model = ? AND chunk_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for chunk_hash, blob in rows:
+                    found[chunk_hash] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def set_many(self, model: str, items: Dict[str, List[float]]):
+        """Store embeddings for the given keys"""
+        rows = [
+            (model, key, np.asarray(embedding, dtype=np.float32).tobytes())
+            for key, embedding in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, chunk_hash, embedding) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,45 @@
+import threading
+from typing import Iterator, Tuple
+
+# PDFium (pypdfium2) extracts text several times faster than PyPDF
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# PDFium is not thread-safe, even across different documents. RAG ingestion loads
+# documents on a thread pool while the agents read PDFs on Streamlit's script threads,
+# so every pdfium call in the process must go through this module and hold this lock
+PDFIUM_LOCK = threading.Lock()
+
+
+def iter_pdf_pages(file_path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page index, text) for each page of a PDF.
+    The lock is held only while calling into PDFium, never across a yield.
+    """
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(str(file_path))
+        page_count = len(pdf)
+    try:
+        for i in range(page_count):
+            with PDFIUM_LOCK:
+                page = pdf[i]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_range()
+                    finally:
+                        textpage.close()
+                finally:
+                    page.close()
+            yield i, text
+    finally:
+        with PDFIUM_LOCK:
+            pdf.close()
+
+
+def extract_pdf_text(file_path: str) -> str:
+    """Return the text of every page of a PDF, one page per line"""
+    return "\n".join(text for _, text in iter_pdf_pages(file_path))
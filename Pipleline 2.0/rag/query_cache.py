@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class QueryCache:
+    """
+    In-process LRU cache of search results.
+    Exact repeats are served by query string; near-duplicate queries are served
+    when their embedding's cosine similarity to a cached query is above a threshold.
+    """
+
+    def __init__(self, max_size: int = 512, similarity_threshold: float = 0.97):
+        self.max_size = max_size
+        self.similarity_threshold = similarity_threshold
+        # (query, params) -> (normalized embedding, results)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _copy(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return a copy so callers cannot mutate the cached results"""
+        return [dict(result) for result in results]
+
+    def get(self, query: str, params: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for an exact query, or None"""
+        key = (query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return self._copy(entry[1])
+
+    def get_similar(self, embedding, params: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for the most similar cached query, or None"""
+        query_vector = self._normalize(embedding)
+        with self._lock:
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if key[1] == params and entry[0].shape == query_vector.shape
+            ]
+            if not candidates:
+                return None
+            matrix = np.stack([entry[0] for _, entry in candidates])
+            scores = np.einsum("ij,j->i", matrix, query_vector)
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            return self._copy(entry[1])
+
+    def put(self, query: str, params: Hashable, embedding, results: List[Dict[str, Any]]):
+        """Cache results for a query, evicting the least recently used entry if full"""
+        key = (query, params)
+        with self._lock:
+            self._entries[key] = (self._normalize(embedding), self._copy(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results, e.g. after the collection changes"""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -77,15 +77,24 @@ class RAGAgent(BaseAgent):
         if n_results is None:
             n_results = self.config.DEFAULT_SEARCH_RESULTS
             
-        # Reformulate query if enabled
-        if self.config.QUERY_REFORMULATION_ENABLED:
-            query = self.reformulate_query(query)
-            
-        self.retrieved_docs = self.document_store.search_documents(
-            query=query,
-            n_results=n_results,
-            filter_dict=filter_dict
-        )
+        # Known prompts are answered from the document store's warm-up cache, unless
+        # the query would have been reformulated before searching
+        warm_results = None
+        if filter_dict is None and self.config.warm_results_enabled():
+            warm_results = self.document_store.get_warm_results(query, n_results)
+        
+        if warm_results is not None:
+            self.retrieved_docs = warm_results
+        else:
+            # Reformulate query if enabled
+            if self.config.QUERY_REFORMULATION_ENABLED:
+                query = self.reformulate_query(query)
+                
+            self.retrieved_docs = self.document_store.search_documents(
+                query=query,
+                n_results=n_results,
+                filter_dict=filter_dict
+            )
         
         # Apply re-ranking if enabled
         if self.config.RERANKING_ENABLED and self.retrieved_docs:
@@ -20,10 +20,10 @@ class RAGManager:
         if not uploaded_files:
             return 0
             
-        successful = 0
         temp_dir = Path("./temp_uploads")
         temp_dir.mkdir(exist_ok=True)
         
+        temp_paths = []
         for uploaded_file in uploaded_files:
             # Get file extension
             file_extension = Path(uploaded_file.name).suffix.lower()
@@ -36,14 +36,17 @@ class RAGManager:
             temp_path = temp_dir / uploaded_file.name
             with open(temp_path, "wb") as f:
                 f.write(uploaded_file.getbuffer())
+            temp_paths.append(str(temp_path))
+        
+        try:
+            # Add to document store in one batch
+            results = self.document_store.add_documents(temp_paths)
+        finally:
+            # Remove temp files
+            for temp_path in temp_paths:
+                os.remove(temp_path)
                 
-            # Add to document store
-            if self.document_store.add_document(str(temp_path)):
-                successful += 1
-                
-            # Remove temp file
-            os.remove(temp_path)
-                
+        successful = sum(results)
         return successful
     
     def get_document_count(self):
@@ -5,16 +5,76 @@ import streamlit as st
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 import os
+import shutil
 import time
 
-def render_header():
-    """Render the main header component"""
-    st.markdown("""
+# Static UI content, built once at import instead of on every Streamlit rerun
+HEADER_HTML = """
     <div class="modern-header">
         <h1>🚀 Automatic Lab Generation Using Multi-Agent RL</h1>
         <p>Transform your ideas into interactive virtual labs with AI</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+MODEL_OPTIONS = (
+    ("gemini-2.5-flash", "Gemini 2.5 Flash", 10, 250_000, 250),
+    ("gemini-2.5-flash-lite-preview-06-17", "Gemini 2.5 Flash-Lite Preview 06-17", 15, 250_000, 1000),
+    ("gemini-2.5-flash-preview-tts", "Gemini 2.5 Flash Preview TTS", 3, 10_000, 15),
+    ("gemini-2.0-flash", "Gemini 2.0 Flash", 15, 1_000_000, 200),
+    ("gemini-2.0-flash-preview-image", "Gemini 2.0 Flash Preview Image Generation", 10, 200_000, 100),
+    ("gemini-2.0-flash-lite", "Gemini 2.0 Flash-Lite", 30, 1_000_000, 200),
+    ("gemini-1.5-flash", "Gemini 1.5 Flash (Deprecated)", 15, 250_000, 50),
+    ("gemini-1.5-flash-8b", "Gemini 1.5 Flash-8B (Deprecated)", 15, 250_000, 50),
+    ("gemma-3", "Gemma 3 & 3n", 30, 15_000, 14_400),
+    ("gemini-embedding-experimental-03-07", "Gemini Embedding Experimental 03-07", 5, None, 100),
+)
+MODEL_LABELS = [label for _, label, *_ in MODEL_OPTIONS]
+MODEL_KEYS = [k for k, *_ in MODEL_OPTIONS]
+
+MODEL_LIMITS_MARKDOWN = """
+| Model | RPM | TPM | RPD |
+|-------|-----|------|------|
+| Gemini 2.5 Pro | -- | -- | -- |
+| Gemini 2.5 Flash | 10 | 250,000 | 250 |
+| Gemini 2.5 Flash-Lite Preview 06-17 | 15 | 250,000 | 1,000 |
+| Gemini 2.5 Flash Preview TTS | 3 | 10,000 | 15 |
+| Gemini 2.5 Pro Preview TTS | -- | -- | -- |
+| Gemini 2.0 Flash | 15 | 1,000,000 | 200 |
+| Gemini 2.0 Flash Preview Image Generation | 10 | 200,000 | 100 |
+| Gemini 2.0 Flash-Lite | 30 | 1,000,000 | 200 |
+| Imagen 3 | -- | -- | -- |
+| Veo 2 | -- | -- | -- |
+| Gemini 1.5 Flash (Deprecated) | 15 | 250,000 | 50 |
+| Gemini 1.5 Flash-8B (Deprecated) | 15 | 250,000 | 50 |
+| Gemini 1.5 Pro (Deprecated) | -- | -- | -- |
+| Gemma 3 & 3n | 30 | 15,000 | 14,400 |
+| Gemini Embedding Experimental 03-07 | 5 | -- | 100 |
+"""
+
+PIPELINE_STEPS = (
+    ("requirements", "📝 Requirements"),
+    ("review", "👁️ Review"),
+    ("implementation", "🔧 Implementation"),
+    ("code", "💻 Code"),
+    ("documentation", "📚 Documentation"),
+    ("website", "🌐 Website"),
+)
+STEP_TRACKER_PREFIX = '<div style="display:flex;gap:1rem;justify-content:center;margin:1.5rem 0 1.5rem 0;">'
+STEP_STYLE_COMPLETED = "background:linear-gradient(135deg,#38a169,#68d391);color:white;border:2px solid #38a169;"
+STEP_STYLE_CURRENT = "background:linear-gradient(135deg,#667eea,#764ba2);color:white;border:2px solid #667eea;"
+STEP_STYLE_PENDING = "background:#e2e8f0;color:#6c757d;border:2px solid #cbd5e1;"
+
+CHAT_RENDER_LIMIT = 100
+CHAT_CONTAINER_PREFIX = """
+    <div class="chat-container">
+        """
+CHAT_CONTAINER_SUFFIX = """
+    </div>
+    """
+
+def render_header():
+    """Render the main header component"""
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 def render_theme_toggle():
     """Render theme toggle button (Python only, no JS)"""
@@ -38,61 +98,41 @@ def render_progress_tracker(progress):
         """, unsafe_allow_html=True
     )
 
+def _render_step_box(step_key, step_label, current_step, completed_steps):
+    """Render a single box of the step tracker"""
+    if completed_steps.get(step_key, False):
+        color = STEP_STYLE_COMPLETED
+    elif current_step == step_key:
+        color = STEP_STYLE_CURRENT
+    else:
+        color = STEP_STYLE_PENDING
+    return f'<div style="padding:1rem 1.5rem;border-radius:12px;font-weight:700;font-size:1.1rem;{color}min-width:120px;text-align:center;transition:all 0.2s;">{step_label}</div>'
+
 def render_step_tracker(current_step, completed_steps):
     """Render horizontal step tracker as boxes below the title"""
-    steps = [
-        ("requirements", "📝 Requirements"),
-        ("review", "👁️ Review"),
-        ("implementation", "🔧 Implementation"),
-        ("code", "💻 Code"),
-        ("documentation", "📚 Documentation"),
-        ("website", "🌐 Website"),
-    ]
-    box_html = '<div style="display:flex;gap:1rem;justify-content:center;margin:1.5rem 0 1.5rem 0;">'
-    for step_key, step_label in steps:
-        if completed_steps.get(step_key, False):
-            color = "background:linear-gradient(135deg,#38a169,#68d391);color:white;border:2px solid #38a169;"
-        elif current_step == step_key:
-            color = "background:linear-gradient(135deg,#667eea,#764ba2);color:white;border:2px solid #667eea;"
-        else:
-            color = "background:#e2e8f0;color:#6c757d;border:2px solid #cbd5e1;"
-        box_html += f'<div style="padding:1rem 1.5rem;border-radius:12px;font-weight:700;font-size:1.1rem;{color}min-width:120px;text-align:center;transition:all 0.2s;">{step_label}</div>'
-    box_html += '</div>'
-    st.markdown(box_html, unsafe_allow_html=True)
+    boxes = "".join(
+        _render_step_box(step_key, step_label, current_step, completed_steps)
+        for step_key, step_label in PIPELINE_STEPS
+    )
+    st.markdown(f'{STEP_TRACKER_PREFIX}{boxes}</div>', unsafe_allow_html=True)
 
 def render_model_selection():
     """Render AI model selection with temperature and max tokens, and a button to show model limits"""
-    model_options = [
-        ("gemini-2.5-flash", "Gemini 2.5 Flash", 10, 250_000, 250),
-        ("gemini-2.5-flash-lite-preview-06-17", "Gemini 2.5 Flash-Lite Preview 06-17", 15, 250_000, 1000),
-        ("gemini-2.5-flash-preview-tts", "Gemini 2.5 Flash Preview TTS", 3, 10_000, 15),
-        ("gemini-2.0-flash", "Gemini 2.0 Flash", 15, 1_000_000, 200),
-        ("gemini-2.0-flash-preview-image", "Gemini 2.0 Flash Preview Image Generation", 10, 200_000, 100),
-        ("gemini-2.0-flash-lite", "Gemini 2.0 Flash-Lite", 30, 1_000_000, 200),
-        ("gemini-1.5-flash", "Gemini 1.5 Flash (Deprecated)", 15, 250_000, 50),
-        ("gemini-1.5-flash-8b", "Gemini 1.5 Flash-8B (Deprecated)", 15, 250_000, 50),
-        ("gemma-3", "Gemma 3 & 3n", 30, 15_000, 14_400),
-        ("gemini-embedding-experimental-03-07", "Gemini Embedding Experimental 03-07", 5, None, 100),
-    ]
-
     st.markdown("#### 🤖 AI Configuration")
 
-    model_labels = [label for _, label, *_ in model_options]
-    model_keys = [k for k, *_ in model_options]
-
-    default_idx = model_keys.index(
-        st.session_state.get("selected_model", model_keys[0])
-    ) if st.session_state.get("selected_model", model_keys[0]) in model_keys else 0
+    default_idx = MODEL_KEYS.index(
+        st.session_state.get("selected_model", MODEL_KEYS[0])
+    ) if st.session_state.get("selected_model", MODEL_KEYS[0]) in MODEL_KEYS else 0
 
     selected_idx = st.selectbox(
         "Choose AI Model:",
-        options=list(range(len(model_keys))),
-        format_func=lambda i: model_labels[i],
+        options=list(range(len(MODEL_KEYS))),
+        format_func=lambda i: MODEL_LABELS[i],
         index=default_idx,
         key="model_selector"
     )
 
-    selected_model = model_keys[selected_idx]
+    selected_model = MODEL_KEYS[selected_idx]
 
     temp = st.slider(
         "Temperature",
@@ -127,25 +167,7 @@ def render_model_selection():
         """, unsafe_allow_html=True)
         with st.sidebar:
             st.markdown("### Gemini Model Limits")
-            st.markdown("""
-| Model | RPM | TPM | RPD |
-|-------|-----|------|------|
-| Gemini 2.5 Pro | -- | -- | -- |
-| Gemini 2.5 Flash | 10 | 250,000 | 250 |
-| Gemini 2.5 Flash-Lite Preview 06-17 | 15 | 250,000 | 1,000 |
-| Gemini 2.5 Flash Preview TTS | 3 | 10,000 | 15 |
-| Gemini 2.5 Pro Preview TTS | -- | -- | -- |
-| Gemini 2.0 Flash | 15 | 1,000,000 | 200 |
-| Gemini 2.0 Flash Preview Image Generation | 10 | 200,000 | 100 |
-| Gemini 2.0 Flash-Lite | 30 | 1,000,000 | 200 |
-| Imagen 3 | -- | -- | -- |
-| Veo 2 | -- | -- | -- |
-| Gemini 1.5 Flash (Deprecated) | 15 | 250,000 | 50 |
-| Gemini 1.5 Flash-8B (Deprecated) | 15 | 250,000 | 50 |
-| Gemini 1.5 Pro (Deprecated) | -- | -- | -- |
-| Gemma 3 & 3n | 30 | 15,000 | 14,400 |
-| Gemini Embedding Experimental 03-07 | 5 | -- | 100 |
-""")
+            st.markdown(MODEL_LIMITS_MARKDOWN)
             st.info("RPM = Requests Per Minute, TPM = Tokens Per Minute, RPD = Requests Per Day")
             if st.button("❌ Close Model Limits", key="close_model_limits_btn"):
                 st.session_state.show_model_limits = False
@@ -164,28 +186,30 @@ def render_file_upload_for_requirements():
     )
     if uploaded_file is not None:
         temp_path = Path("temp_requirements.pdf")
+        # Stream the upload to disk in chunks instead of copying it into one bytes object
+        uploaded_file.seek(0)
         with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getvalue())
+            shutil.copyfileobj(uploaded_file, f, length=1 << 16)
         st.session_state.uploaded_file = temp_path
         st.markdown(render_status_badge("success", "✅ PDF uploaded successfully!"), unsafe_allow_html=True)
     return uploaded_file
 
+def _render_chat_message(message):
+    """Render a single chat message as HTML"""
+    if message["role"] == "user":
+        return f'<div class="chat-message chat-user"><strong>You:</strong> {message["content"]}</div>'
+    elif message["role"] == "system":
+        return f'<div class="chat-message chat-system">{message["content"]}</div>'
+    else:
+        return f'<div class="chat-message chat-ai"><strong>AI:</strong> {message["content"]}</div>'
+
 def render_chat_interface():
     """Render chat interface component (no card)"""
-    chat_messages = ""
-    for message in st.session_state.chat_history:
-        if message["role"] == "user":
-            chat_messages += f'<div class="chat-message chat-user"><strong>You:</strong> {message["content"]}</div>'
-        elif message["role"] == "system":
-            chat_messages += f'<div class="chat-message chat-system">{message["content"]}</div>'
-        else:
-            chat_messages += f'<div class="chat-message chat-ai"><strong>AI:</strong> {message["content"]}</div>'
+    # Only the most recent messages are rendered to keep reruns cheap for long chats
+    recent_messages = st.session_state.chat_history[-CHAT_RENDER_LIMIT:]
+    chat_messages = "".join([_render_chat_message(message) for message in recent_messages])
     st.markdown("#### 🤖 Support Chatbot")
-    st.markdown(f"""
-    <div class="chat-container">
-        {chat_messages}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(f"{CHAT_CONTAINER_PREFIX}{chat_messages}{CHAT_CONTAINER_SUFFIX}", unsafe_allow_html=True)
     chat_input = st.text_input(
         "💬 Ask me anything:",
         placeholder="How can I help you today?",
@@ -394,22 +418,31 @@ def process_rag_files(uploaded_files, document_store) -> Tuple[int, List[Dict]]:
         
     successful = 0
     docs_metadata = []
+    saved_files = []
     
-    for uploaded_file in uploaded_files:
-        # Save the uploaded file temporarily - use a more consistent naming pattern
-        # Include a timestamp to avoid name collisions
-        timestamp = int(time.time())
-        filename = uploaded_file.name
-        # Remove any existing temp_upload_ prefix to avoid double prefixing
-        if filename.startswith("temp_upload_"):
-            filename = filename[12:]
-        temp_file_path = f"temp_upload_{timestamp}_{filename}"
-        with open(temp_file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+    try:
+        for uploaded_file in uploaded_files:
+            # Save the uploaded file temporarily - use a more consistent naming pattern
+            # Include a timestamp to avoid name collisions
+            timestamp = int(time.time())
+            filename = uploaded_file.name
+            # Remove any existing temp_upload_ prefix to avoid double prefixing
+            if filename.startswith("temp_upload_"):
+                filename = filename[12:]
+            temp_file_path = f"temp_upload_{timestamp}_{filename}"
+            with open(temp_file_path, "wb") as f:
+                f.write(uploaded_file.getbuffer())
+            saved_files.append((uploaded_file, temp_file_path))
         
+        # Add all files in one call so their chunks are embedded together
         try:
-            # Add to document store
-            if document_store.add_document(temp_file_path):
+            results = document_store.add_documents([path for _, path in saved_files])
+        except Exception as e:
+            st.error(f"Error processing uploaded files: {str(e)}")
+            results = [False] * len(saved_files)
+        
+        for (uploaded_file, temp_file_path), added in zip(saved_files, results):
+            if added:
                 successful += 1
                 docs_metadata.append({
                     "name": uploaded_file.name,
@@ -426,15 +459,25 @@ def process_rag_files(uploaded_files, document_store) -> Tuple[int, List[Dict]]:
                 })
             else:
                 st.error(f"Failed to add {uploaded_file.name} to knowledge base")
-        except Exception as e:
-            st.error(f"Error processing {uploaded_file.name}: {str(e)}")
-        finally:
-            # Clean up temp file
+    finally:
+        # Clean up temp files
+        for _, temp_file_path in saved_files:
             if os.path.exists(temp_file_path):
                 os.remove(temp_file_path)
     
     return successful, docs_metadata
 
+def get_pipeline_step_prompts() -> List[str]:
+    """Return the static prompts that pipeline agents use as RAG search queries"""
+    # Only agents relying on BaseAgent.get_output search with their basic prompt
+    from Agents.RequirementsAgent import RequirementsAgent
+    from Agents.DocumentationAgent import DocumentationAgent
+    
+    return [
+        RequirementsAgent.basic_prompt,
+        DocumentationAgent.basic_prompt_template,
+    ]
+
 def initialize_rag(force=False):
     """Initialize RAG components"""
     try:
@@ -455,6 +498,12 @@ def initialize_rag(force=False):
                 
                 # Verify initialization
                 if hasattr(st.session_state.document_store, 'collection'):
+                    # Pre-embed the pipeline prompts so their searches are instant; this
+                    # loads the embedding model now rather than on the first search, so
+                    # only do it when the agents will actually be served warm results
+                    rag_config = st.session_state.document_store.config
+                    if rag_config.WARMUP_ON_INIT and rag_config.warm_results_enabled():
+                        st.session_state.document_store.warmup(get_pipeline_step_prompts())
                     st.success("✅ RAG components initialized successfully")
                     return True
                 else:
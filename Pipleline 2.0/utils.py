@@ -79,7 +79,10 @@ def initialize_rag():
         # Then initialize the document store
         if "document_store" not in st.session_state:
             from rag.document_store import DocumentStore
-            st.session_state.document_store = DocumentStore()
+            document_store = DocumentStore()
+            # ChromaDB is opened lazily; open it here so failures are reported
+            document_store.collection
+            st.session_state.document_store = document_store
         
         return True
     except Exception as e: